@@ -5,11 +5,11 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-import copy
+import functools
 import logging
 import re
 from collections import Counter, defaultdict
-from typing import List, Iterable, Set, Any
+from typing import List, Set, Any
 
 from benchexec.tablegenerator.columns import Column, ColumnType
 
@@ -33,14 +33,73 @@ TEX_HEADER = r"""% Statistics produced by BenchExec, more information at
 \providecommand\StoreBenchExecResult[7]{\expandafter\newcommand\csname#1#2#3#4#5#6\endcsname{#7}}%
 """
 
+# Matches only positive numbers, because 0 can't be converted to roman number
+_RE_POSITIVE_NUMBER = re.compile(r"[1-9]\d*")
+_RE_NON_ALPHA = re.compile(r"[^a-zA-Z]")
+# Translation table for ASCII strings that replaces all characters except letters
+# with spaces. A string is used because it is faster than a dict from str.maketrans.
+_NON_ALPHA_TO_SPACE = "".join(
+    c if "a" <= c <= "z" or "A" <= c <= "Z" else " " for c in map(chr, range(128))
+)
+
 RENAME_FUNCTIONS = {
     "column": lambda value: "all" if value.lower() == "total" else value,
 }
 
+# Fields of ColumnStatistics in the order in which they are written, which is the order
+# in which they are filled by the functions in statistics.py
+_COLUMN_STATISTICS_FIELDS = (
+    "score",
+    "total",
+    "correct",
+    "correct_true",
+    "correct_false",
+    "correct_unconfirmed",
+    "correct_unconfirmed_true",
+    "correct_unconfirmed_false",
+    "wrong",
+    "wrong_true",
+    "wrong_false",
+    "local",
+)
+
+# Fields of StatValue in the order in which they are written
+_STAT_VALUE_FIELDS = ("sum", "min", "max", "avg", "median", "stdev")
+
+# Suffixes for duplicated names and numbers in names are converted repeatedly,
+# but only few different numbers occur
+_number_to_roman_string = functools.lru_cache(maxsize=128)(util.number_to_roman_string)
+
+# Command parts that are part of LatexCommand._prefix
+_PREFIX_PARTS = frozenset(("benchmark_name", "runset_name", "column_title"))
+
 
 class LatexCommand:
     """Data holder for latex command."""
 
+    __slots__ = (
+        "benchmark_name",
+        "runset_name",
+        "column_title",
+        "column",
+        "status",
+        "stat_type",
+        "value",
+        "_prefix",
+    )
+
+    # Names of the parts that can be set with set_command_part
+    _part_names = frozenset(
+        (
+            "benchmark_name",
+            "runset_name",
+            "column_title",
+            "column",
+            "status",
+            "stat_type",
+        )
+    )
+
     def __init__(self, benchmark_name="", runset_name=""):
         self.benchmark_name = LatexCommand.format_command_part(str(benchmark_name))
         self.runset_name = LatexCommand.format_command_part(str(runset_name))
@@ -49,6 +108,14 @@ class LatexCommand:
         self.status = ""
         self.stat_type = ""
         self.value = None
+        self._update_prefix()
+
+    def _update_prefix(self):
+        """Precomputes the part of the command that is the same for a whole column"""
+        self._prefix = (
+            f"\\StoreBenchExecResult{{{self.benchmark_name}}}"
+            f"{{{self.runset_name}}}{{{self.column_title}}}"
+        )
 
     def set_command_part(self, part_name: str, part_value) -> "LatexCommand":
         """Sets the value of the command part
@@ -63,9 +130,13 @@ class LatexCommand:
         Returns:
             This LatexCommand
         """
+        if part_name not in LatexCommand._part_names:
+            raise AttributeError("unknown command part " + part_name)
         if part_name in RENAME_FUNCTIONS.keys():
             part_value = RENAME_FUNCTIONS[part_name](part_value)
-        self.__dict__[part_name] = LatexCommand.format_command_part(str(part_value))
+        setattr(self, part_name, LatexCommand.format_command_part(str(part_value)))
+        if part_name in _PREFIX_PARTS:
+            self._update_prefix()
         return self
 
     def set_command_value(self, value: Any) -> "LatexCommand":
@@ -80,8 +151,12 @@ class LatexCommand:
             This LatexCommand
         """
         if value is None:
-            value = ""
-        self.value = str(value)
+            self.value = ""
+        elif type(value) is str:
+            # common case, values are usually already formatted
+            self.value = value
+        else:
+            self.value = str(value)
         return self
 
     def to_latex_raw(self) -> str:
@@ -109,29 +184,72 @@ class LatexCommand:
         return command_as_string
 
     def __repr__(self):
-        return "\\StoreBenchExecResult{%s}{%s}{%s}{%s}{%s}{%s}" % (
-            self.benchmark_name,
-            self.runset_name,
-            self.column_title,
-            self.column,
-            self.status,
-            self.stat_type,
-        )
+        return f"{self._prefix}{{{self.column}}}{{{self.status}}}{{{self.stat_type}}}"
 
     @staticmethod
     def format_command_part(name: str) -> str:
-        name = re.sub(
-            # Matches only positive numbers, because 0 can't be converted to roman number
-            "[1-9]\\d*",
-            lambda match: util.number_to_roman_string(match.group()),
-            name,
-        )
+        return _format_command_part(name)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_command_part(name: str) -> str:
+    # cached because the same few names are formatted again for every column
+    if name.isascii() and name.isalpha():
+        # common case of a name without numbers and separators
+        return name[0].upper() + name[1:]
+
+    name = _RE_POSITIVE_NUMBER.sub(
+        lambda match: _number_to_roman_string(match.group()), name
+    )
 
-        name = re.split("[^a-zA-Z]", name)
+    if name.isascii():
+        # faster than splitting with the regex
+        words = name.translate(_NON_ALPHA_TO_SPACE).split()
+    else:
+        words = _RE_NON_ALPHA.split(name)
 
-        name = "".join(util.cap_first_letter(word) for word in name)
+    # Same as util.cap_first_letter, but inlined and skipping empty words,
+    # which are common because every non-alphabetic character splits the name
+    return "".join([word[0].upper() + word[1:] for word in words if word])
 
-        return name
+
+def _split_stat_name(stat_name: str):
+    """Splits the name of a field of ColumnStatistics into its parts
+
+    Args:
+        stat_name: Name of a field of ColumnStatistics, e.g. correct_unconfirmed_true
+
+    Returns:
+        A tuple of the original column name (e.g. correct_unconfirmed), and the
+        formatted command parts column (e.g. CorrectUnconfirmed) and status (e.g. True)
+    """
+    column_parts = stat_name.rsplit("_", 1)
+    # If the stat_name is not ending with true or false, use the whole stat_name as column and an empty string
+    # as column_subcategory
+    if column_parts[-1].lower() in ["true", "false"]:
+        status = column_parts[-1]
+        column_list = column_parts[0:-1]
+    else:
+        status = ""
+        column_list = column_parts
+
+    # Some colum_categories use _ in their names, that's why the column_category is the
+    # whole split list except the last word
+    column = "".join(util.cap_first_letter(column_part) for column_part in column_list)
+
+    # Formatting like LatexCommand.set_command_part does
+    command = LatexCommand().set_command_part("column", column)
+    command.set_command_part("status", status)
+
+    # Joining the column together to get the name original name
+    return "_".join(column_list), command.column, command.status
+
+
+# The parts of each field of ColumnStatistics as returned by _split_stat_name,
+# which are the same for every column of every run set
+_STAT_NAME_PARTS = {
+    stat_name: _split_stat_name(stat_name) for stat_name in _COLUMN_STATISTICS_FIELDS
+}
 
 
 def write_tex_command_table(
@@ -140,8 +258,10 @@ def write_tex_command_table(
     stats: List[List[ColumnStatistics]],
     **kwargs,
 ):
-    # Saving the formatted benchmarkname and niceName with the id of the runset to prevent latter formatting
-    formatted_names = {}
+    # Formatting benchmarkname and niceName of each runset once and counting
+    # the total number of each combination in the same pass
+    formatted_names = []
+    names_total_counts = {}
     for run_set in run_sets:
         benchmark_name_formatted = LatexCommand.format_command_part(
             run_set.attributes["benchmarkname"]
@@ -150,13 +270,13 @@ def write_tex_command_table(
             # name can be a list
             "".join(run_set.attributes["name"])
         )
-        formatted_names[id(run_set)] = benchmark_name_formatted, runset_name_formatted
-
-    # Counts the total number of benchmarkname and niceName combinations
-    names_total_counts = Counter(formatted_names.values())
+        name_tuple = benchmark_name_formatted, runset_name_formatted
+        formatted_names.append(name_tuple)
+        names_total_counts[name_tuple] = names_total_counts.get(name_tuple, 0) + 1
 
-    # Counts the actual used benchmarkname and niceName combinations
-    names_already_used = defaultdict(int)
+    # Counts the actual used benchmarkname and niceName combinations,
+    # only necessary for duplicated combinations
+    names_already_used = {}
 
     # Filtering all candidates for skipping
     skipped_columns = {"correct_unconfirmed"}
@@ -167,33 +287,36 @@ def write_tex_command_table(
     }
 
     out.write(TEX_HEADER)
-    for run_set, stat_list in zip(run_sets, stats):
-        name_tuple = formatted_names[id(run_set)]
-
-        # Increasing the count before the check to add suffix 1 to the first encounter of a duplicated
-        # benchmarkname + niceName combination
-        names_already_used[name_tuple] += 1
+    for run_set, stat_list, name_tuple in zip(run_sets, stats, formatted_names):
         benchmark_name_formatted, runset_name_formatted = name_tuple
 
         # Duplication detected, adding suffix to benchmarkname
         if names_total_counts[name_tuple] > 1:
-            suffix = util.number_to_roman_string(names_already_used[name_tuple])
-            logging.warning(
-                'Duplicated formatted benchmark name + runset name "%s" detected. '
-                "The combination of names must be unique for Latex. "
-                "Adding suffix %s to benchmark name",
-                benchmark_name_formatted + runset_name_formatted,
-                suffix,
-            )
+            # Increasing the count before creating the suffix to add suffix 1 to the
+            # first encounter of a duplicated benchmarkname + niceName combination
+            used_count = names_already_used.get(name_tuple, 0) + 1
+            names_already_used[name_tuple] = used_count
+            suffix = _number_to_roman_string(used_count)
+            if used_count == 1:
+                # Warning only once for each duplicated combination
+                logging.warning(
+                    'Duplicated formatted benchmark name + runset name "%s" detected. '
+                    "The combination of names must be unique for Latex. "
+                    "Adding suffixes %s to %s to benchmark name",
+                    benchmark_name_formatted + runset_name_formatted,
+                    suffix,
+                    _number_to_roman_string(names_total_counts[name_tuple]),
+                )
             benchmark_name_formatted += suffix
 
         command = LatexCommand(benchmark_name_formatted, runset_name_formatted)
 
-        for latex_command in _provide_latex_commands(
-            run_set, stat_list, command, skipped_columns
-        ):
-            out.write(latex_command.to_latex_score_as_stat_type())
-            out.write("%\n")
+        # Collecting all lines of a run set for a single write call
+        lines = []
+        _emit_latex_commands(lines, run_set, stat_list, command, skipped_columns)
+        # The empty last element adds the line terminator after the last line
+        lines.append("")
+        out.write("%\n".join(lines))
 
 
 def _statistics_has_value_for(
@@ -218,23 +341,22 @@ def _statistics_has_value_for(
     return False
 
 
-def _provide_latex_commands(
+def _emit_latex_commands(
+    lines: List[str],
     run_set,
     stat_list: List[ColumnStatistics],
     current_command: LatexCommand,
     skipped_columns: Set[str],
-) -> Iterable[LatexCommand]:
+):
     """
-    Provides all LatexCommands for a given run_set + stat_list combination
+    Adds all LatexCommands for a given run_set + stat_list combination to lines
 
     Args:
+        lines: List to which the LatexCommands are appended as strings
         run_set: A RunSetResult object
         stat_list: List of ColumnStatistics for each column in run_set
         current_command: LatexCommand with benchmark_name and displayName already filled
         skipped_columns: Set with all columns, which should be skipped
-
-    Yields:
-        All LatexCommands from the run_set + stat_list combination
     """
 
     # Preferring the display title over the standard title of a column to allow
@@ -242,22 +364,20 @@ def _provide_latex_commands(
     def select_column_name(col):
         return col.display_title or col.title
 
-    column_titles_total_count = Counter(
-        select_column_name(column) for column in run_set.columns
-    )
+    column_titles = [select_column_name(column) for column in run_set.columns]
+    duplicated_column_titles = {
+        title for title, count in Counter(column_titles).items() if count > 1
+    }
     column_titles_already_used = defaultdict(int)
 
-    for column, column_stats in zip(run_set.columns, stat_list):
-        column_title = select_column_name(column)
-
-        # Increasing the count before the check to add suffix 1 to the first encounter of a duplicated
-        # column title
-        column_titles_already_used[column_title] += 1
-
-        if column_titles_total_count[column_title] > 1:
-            suffix = util.number_to_roman_string(
-                column_titles_already_used[column_title]
-            )
+    for column, column_stats, column_title in zip(
+        run_set.columns, stat_list, column_titles
+    ):
+        if column_title in duplicated_column_titles:
+            # Increasing the count before adding the suffix to add suffix 1 to the
+            # first encounter of a duplicated column title
+            column_titles_already_used[column_title] += 1
+            suffix = _number_to_roman_string(column_titles_already_used[column_title])
             logging.warning(
                 'Duplicated formatted column name "%s" detected! '
                 "Column names must be unique for Latex. "
@@ -269,63 +389,56 @@ def _provide_latex_commands(
 
         current_command.set_command_part("column_title", column_title)
 
-        yield from _column_statistic_to_latex_command(
-            current_command, column_stats, column, skipped_columns
+        _emit_column_statistic_latex_commands(
+            lines, current_command, column_stats, column, skipped_columns
         )
 
 
-def _column_statistic_to_latex_command(
-    init_command: LatexCommand,
+def _emit_column_statistic_latex_commands(
+    lines: List[str],
+    command: LatexCommand,
     column_statistic: ColumnStatistics,
     parent_column: Column,
     skipped_columns: Set[str],
-) -> Iterable[LatexCommand]:
-    """Parses a ColumnStatistics to Latex Commands and yields them
+):
+    """Parses a ColumnStatistics to Latex Commands and adds them to lines
 
     The provided LatexCommand must have specified benchmark_name, display_name and column_name.
+    All other parts of it are overwritten for each added command.
 
     Args:
-        init_command: LatexCommand with not empty benchmark_name and display_name
+        lines: List to which the LatexCommands are appended as strings
+        command: LatexCommand with not empty benchmark_name and display_name
         column_statistic: ColumnStatistics to convert to LatexCommand
         parent_column: Current column with meta-data
         skipped_columns: Set with all columns, which should be skipped
-    Yields:
-        A completely filled LatexCommand
     """
     if not column_statistic:
         return
 
+    # The unit is the same for all statistics of the column, so it is prepared only
+    # once, but each statistic gets its own unit command
+    unit = parent_column.unit
+    if unit:
+        unit_stat_type = LatexCommand.format_command_part("unit")
+        unit = str(unit)
+
     stat_value: StatValue
-    for stat_name, stat_value in column_statistic.__dict__.items():
+    for stat_name in _COLUMN_STATISTICS_FIELDS:
+        stat_value = getattr(column_statistic, stat_name)
         if stat_value is None:
             continue
 
-        column_parts = stat_name.rsplit("_", 1)
-        # If the stat_name is not ending with true or false, use the whole stat_name as column and an empty string
-        # as column_subcategory
-        if column_parts[-1].lower() in ["true", "false"]:
-            status = column_parts[-1]
-            column_list = column_parts[0:-1]
-        else:
-            status = ""
-            column_list = column_parts
-
-        # Joining the column together to get the name original name
-        if "_".join(column_list) in skipped_columns:
+        column_name, column, status = _STAT_NAME_PARTS[stat_name]
+        if column_name in skipped_columns:
             continue
 
-        # Copy command to prevent using filled command parts from previous iterations
-        command = copy.deepcopy(init_command)
-
-        # Some colum_categories use _ in their names, that's why the column_category is the
-        # whole split list except the last word
-        command.set_command_part(
-            "column",
-            "".join(util.cap_first_letter(column_part) for column_part in column_list),
-        )
-        command.set_command_part("status", status)
+        # Already formatted, so set_command_part is not necessary
+        command.column = column
+        command.status = status
 
-        for k, v in stat_value.__dict__.items():
+        for k in _STAT_VALUE_FIELDS:
+            v = getattr(stat_value, k)
             # "v is None" instead of "if not v" used to allow number 0
             if v is None:
                 continue
@@ -341,8 +454,9 @@ def _column_statistic_to_latex_command(
             command.set_command_value(
                 parent_column.format_value(value=v, format_target="csv")
             )
-            yield command
-        if parent_column.unit:
-            command.set_command_part("stat_type", "unit")
-            command.set_command_value(parent_column.unit)
-            yield command
+            lines.append(command.to_latex_score_as_stat_type())
+        if unit:
+            # Already formatted, so set_command_part is not necessary
+            command.stat_type = unit_stat_type
+            command.value = unit
+            lines.append(command.to_latex_score_as_stat_type())
@@ -0,0 +1,65 @@
+# This file is part of BenchExec, a framework for reliable benchmarking:
+# https://github.com/sosy-lab/benchexec
+#
+# SPDX-FileCopyrightText: 2007-2020 Dirk Beyer <https://www.sosy-lab.org>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import sys
+import unittest
+
+from benchexec.tablegenerator import statisticstex
+from benchexec.tablegenerator.statistics import ColumnStatistics, StatValue
+from benchexec.tablegenerator.statisticstex import LatexCommand
+
+sys.dont_write_bytecode = True  # prevent creation of .pyc files
+
+
+class TestLatexCommand(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.longMessage = True
+        cls.maxDiff = None
+
+    def test_format_command_part(self):
+        for k, v in [
+            ("", ""),
+            ("cputime", "Cputime"),
+            ("cpuTime", "CpuTime"),
+            ("cpu time", "CpuTime"),
+            ("cpu_time", "CpuTime"),
+            ("cpu--time", "CpuTime"),
+            ("cpu-time (s)", "CpuTimeS"),
+            ("1", "I"),
+            ("0", ""),
+            ("10", "X"),
+            ("run2", "RunII"),
+            ("run 2a", "RunIIa"),
+            ("2019-11-06", "MMXIXXIVI"),
+            ("täst", "TSt"),
+        ]:
+            self.assertEqual(v, LatexCommand.format_command_part(k), msg=k)
+
+    def test_set_command_part(self):
+        command = LatexCommand("benchmark1", "run set")
+        command.set_command_part("column_title", "cpu time")
+        command.set_command_part("column", "total")
+        command.set_command_part("status", "true")
+        command.set_command_part("stat_type", "sum")
+        command.set_command_value(42)
+        self.assertEqual(
+            r"\StoreBenchExecResult{BenchmarkI}{RunSet}{CpuTime}{All}{True}{Sum}{42}",
+            command.to_latex_raw(),
+        )
+
+        self.assertRaises(AttributeError, command.set_command_part, "unknown", "x")
+
+    def test_statistics_fields(self):
+        self.assertEqual(
+            ColumnStatistics._fields,
+            frozenset(statisticstex._COLUMN_STATISTICS_FIELDS),
+        )
+        self.assertEqual(
+            list(StatValue(0).__dict__),
+            list(statisticstex._STAT_VALUE_FIELDS),
+        )